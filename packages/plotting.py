@@ -0,0 +1,58 @@
+"""
+可视化脚本共用的绘图辅助函数（crease_identification.py 与 tools/ 下的工具共用）
+
+本模块不在导入时加载 matplotlib.pyplot，只依赖 numpy。
+"""
+
+import numpy as np
+
+
+# PNG 编码使用最低 zlib 压缩等级（文件稍大，但编码速度快得多）
+PNG_SAVE_KWARGS = {'compress_level': 1}
+
+
+def resolve_serif_font(preferred='Times New Roman', fallback='DejaVu Serif'):
+    """
+    返回可用的衬线字体名（只查询一次字体库）
+    
+    系统中没有 Times New Roman 时退回 matplotlib 自带的 DejaVu Serif，
+    避免每个文本对象都重新查找缺失字体并输出 findfont 警告。
+    """
+    from matplotlib import font_manager
+    available = {font.name for font in font_manager.fontManager.ttflist}
+    return preferred if preferred in available else fallback
+
+
+def get_plot_arrays(mesh):
+    """
+    取出绘图用的紧凑数组：float32 顶点坐标与 int32 面片索引
+    （顶点数超出 int32 范围时面片保留 int64）
+    
+    Returns:
+        vertices: (V, 3) float32 顶点数组
+        faces: (F, 3) 面片索引数组
+    """
+    vertices = np.ascontiguousarray(mesh.vertices, dtype=np.float32)
+    faces = np.asarray(mesh.faces)
+    if len(vertices) < np.iinfo(np.int32).max:
+        faces = faces.astype(np.int32, copy=False)
+    return vertices, np.ascontiguousarray(faces)
+
+
+def compute_bounds(points):
+    """
+    计算点集的包围盒中心与最大半边长（用于等比例坐标范围）
+    
+    Args:
+        points: (..., 3) 坐标数组
+    
+    Returns:
+        mid: (3,) 包围盒中心
+        max_range: 包围盒最大边长的一半
+    """
+    points = points.reshape(-1, 3)
+    min_vals = points.min(axis=0)
+    max_vals = points.max(axis=0)
+    mid = (min_vals + max_vals) / 2
+    max_range = (max_vals - min_vals).max() / 2
+    return mid, max_range
@@ -6,6 +6,8 @@ from pathlib import Path
 from collections import defaultdict
 from typing import List, Dict, Tuple, Set, Optional, Any
 
+from packages.topology import decode_edge_keys, edge_keys
+
 # --- Helper functions ported from feature.py ---
 
 def compute_face_normals(vertices: np.ndarray, faces: np.ndarray) -> np.ndarray:
@@ -20,13 +22,27 @@ def compute_face_normals(vertices: np.ndarray, faces: np.ndarray) -> np.ndarray:
     return normals / norms
 
 def build_edge_face_map(faces: np.ndarray) -> Dict[Tuple[int, int], List[int]]:
-    edge_face_map = defaultdict(list)
-    for face_idx, face in enumerate(faces):
-        for i in range(3):
-            v1, v2 = face[i], face[(i + 1) % 3]
-            edge = (min(v1, v2), max(v1, v2))
-            edge_face_map[edge].append(face_idx)
-    return dict(edge_face_map)
+    faces = np.asarray(faces)
+    if len(faces) == 0:
+        return {}
+    # One int64 key per face edge, in the face-major order (f0, f1), (f1, f2), (f2, f0)
+    n_vertices = int(faces.max()) + 1
+    keys = edge_keys(faces[:, [[0, 1], [1, 2], [2, 0]]], n_vertices)
+    unique_keys, first_index, inverse, counts = np.unique(
+        keys, return_index=True, return_inverse=True, return_counts=True)
+    
+    # Renumber edges by first occurrence so the dict keeps the insertion order
+    # of a face-by-face loop, then group face edges with one stable argsort
+    appearance = np.argsort(first_index, kind='stable')
+    rank = np.empty_like(appearance)
+    rank[appearance] = np.arange(len(appearance))
+    face_ids = (np.argsort(rank[inverse.reshape(-1)], kind='stable') // 3).tolist()
+    ends = np.cumsum(counts[appearance]).tolist()
+    starts = [0] + ends[:-1]
+    
+    edges = decode_edge_keys(unique_keys[appearance], n_vertices)
+    return dict(zip(zip(edges[:, 0].tolist(), edges[:, 1].tolist()),
+                    [face_ids[start:end] for start, end in zip(starts, ends)]))
 
 def detect_sharp_edges(vertices: np.ndarray, faces: np.ndarray, theta0_deg: float) -> Set[Tuple[int, int]]:
     face_normals = compute_face_normals(vertices, faces)
@@ -169,9 +185,12 @@ class MeshPreprocessor:
         print("[MeshPreprocessor] Partitioning regions...")
         self.regions = segment_smooth_regions(self.mesh.faces, self.sharp_edges)
         
+        # Single scatter of region ids over all region faces
         self.face_region_map = np.full(len(self.mesh.faces), -1)
-        for rid, faces in enumerate(self.regions):
-            self.face_region_map[faces] = rid
+        if self.regions:
+            region_faces = np.concatenate(self.regions).astype(np.int64)
+            region_ids = np.repeat(np.arange(len(self.regions)), [len(r) for r in self.regions])
+            self.face_region_map[region_faces] = region_ids
             
         print(f"[MeshPreprocessor] Partitioned into {len(self.regions)} smooth regions.")
         
@@ -0,0 +1,47 @@
+"""
+Undirected edge key encoding shared by the main script, preprocessing and tools/.
+
+Only depends on numpy, so it can be imported without loading trimesh or matplotlib.
+"""
+
+import numpy as np
+
+
+def edge_keys(edges, n_vertices=None):
+    """
+    Encode undirected edges as int64 keys ``v_min * n_vertices + v_max``.
+
+    Keys sort in the same order as the (v_min, v_max) rows, so ``np.unique``
+    on the keys replaces a much slower row-wise ``np.unique(axis=0)``.
+
+    Args:
+        edges: (E, 2) array-like of vertex indices (any endpoint order)
+        n_vertices: Number of vertices in the mesh (default: largest index + 1)
+
+    Returns:
+        (E,) int64 array of keys, equal for (a, b) and (b, a)
+    """
+    edges = np.asarray(edges)
+    if edges.dtype.kind not in 'iu':
+        edges = edges.astype(np.int64)  # e.g. an empty list
+    # Sort in the (possibly int32) index dtype; widen to int64 only for the key math
+    edges = np.sort(edges.reshape(-1, 2), axis=1)
+    if n_vertices is None:
+        n_vertices = int(edges.max()) + 1 if len(edges) else 1
+    return edges[:, 0].astype(np.int64) * np.int64(n_vertices) + edges[:, 1]
+
+
+def decode_edge_keys(keys, n_vertices, dtype=np.int64):
+    """
+    Inverse of edge_keys: turn keys back into (E, 2) edges with ``v_min <= v_max``.
+
+    Args:
+        keys: (E,) int64 keys from edge_keys
+        n_vertices: The same ``n_vertices`` used for encoding
+        dtype: Index dtype of the returned array
+
+    Returns:
+        (E, 2) array of vertex indices
+    """
+    v_min, v_max = np.divmod(np.asarray(keys, dtype=np.int64), np.int64(n_vertices))
+    return np.column_stack([v_min, v_max]).astype(dtype, copy=False)
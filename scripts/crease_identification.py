@@ -6,38 +6,155 @@ and generates visualizations and statistics.
 """
 
 import argparse
+import json
+import multiprocessing
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import numpy as np
-import trimesh
-import matplotlib.pyplot as plt
-from matplotlib.colors import LinearSegmentedColormap
-import json
-import csv
-
-# 设置全局字体为Times
-plt.rcParams['font.family'] = 'serif'
-plt.rcParams['font.serif'] = ['Times New Roman']
-plt.rcParams['axes.unicode_minus'] = False
 
 # Add project root to path to import packages
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from packages.preprocessing import (
-    compute_dihedral_angles,
-    detect_sharp_edges,
-    segment_smooth_regions,
-    MeshPreprocessor
-)
+from packages.plotting import resolve_serif_font
+from packages.topology import edge_keys
+
+# matplotlib / trimesh 按需导入，参数或路径错误时无需加载绘图库即可快速退出
+_plt = None
+
+# 按尺寸缓存的可复用 Figure，批量处理时避免反复分配大画布
+_FIGURE_CACHE = {}
+
+# 二面角颜色映射及颜色条用的 ScalarMappable，首次使用时创建，之后所有网格复用
+_DIHEDRAL_COLORMAP = None
+
+# 调试输出开关：设置环境变量 CREASE_DEBUG=1 时打印热力图的中间检查信息
+DEBUG = os.environ.get('CREASE_DEBUG') == '1'
+
+def get_pyplot():
+    """
+    Import and configure matplotlib.pyplot on first use.
+    
+    Returns:
+        The matplotlib.pyplot module (Agg backend, Times font, interactive mode off)
+    """
+    global _plt
+    if _plt is None:
+        import matplotlib
+        matplotlib.use('Agg')  # 仅输出 PNG；非交互后端也避免多进程间的 GUI 争用
+        import matplotlib.pyplot as plt
+        
+        # 设置全局字体为Times（首次导入时解析一次）
+        plt.rcParams['font.family'] = 'serif'
+        plt.rcParams['font.serif'] = [resolve_serif_font()]
+        plt.rcParams['axes.unicode_minus'] = False
+        
+        # 只写文件，不需要交互模式
+        plt.ioff()
+        _plt = plt
+    return _plt
+
+def get_dihedral_colormap():
+    """
+    Return the shared dihedral colormap objects, created on first use.
+    
+    Returns:
+        (cmap, scalar_mappable): blue -> green -> red colormap and a
+        ScalarMappable normalized to 0-360 degrees for the colorbars
+    """
+    global _DIHEDRAL_COLORMAP
+    if _DIHEDRAL_COLORMAP is None:
+        plt = get_pyplot()
+        from matplotlib.colors import LinearSegmentedColormap
+        
+        # Create a custom colormap: blue (small angle) -> green -> red (large angle)
+        colors = [(0, 0, 1), (0, 1, 0), (1, 0, 0)]  # blue, green, red
+        cmap = LinearSegmentedColormap.from_list('dihedral', colors, N=256)
+        sm = plt.cm.ScalarMappable(cmap=cmap, norm=plt.Normalize(vmin=0, vmax=360))
+        sm.set_array([])
+        _DIHEDRAL_COLORMAP = (cmap, sm)
+    return _DIHEDRAL_COLORMAP
 
 def load_mesh(obj_path):
     """Load a mesh from OBJ file."""
+    import trimesh
     mesh = trimesh.load(obj_path, force='mesh')
     # Mesh is assumed to be triangular (OBJ format)
     return mesh
 
-def process_single_mesh(mesh, theta0_deg, output_dir, figures_dir, mesh_name):
-    """Process a single mesh and generate outputs."""
+def lookup_edge_indices(keys, query_keys):
+    """
+    Find the position of each query key in ``keys`` with a sorted search.
+    
+    Returns:
+        (Q,) int64 array of indices into ``keys``, -1 where the key is absent
+    """
+    result = np.full(len(query_keys), -1, dtype=np.int64)
+    if len(keys) == 0 or len(query_keys) == 0:
+        return result
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    pos = np.minimum(np.searchsorted(sorted_keys, query_keys), len(sorted_keys) - 1)
+    found = sorted_keys[pos] == query_keys
+    result[found] = order[pos[found]]
+    return result
+
+def encode_edge_set(edge_set, n_vertices):
+    """
+    Encode a set of (v1, v2) edges as a frozen, sorted int64 key array.
+    
+    Membership tests against the result (see contains_edge_keys) use a
+    binary search instead of hashing Python tuples.
+    """
+    if not isinstance(edge_set, np.ndarray):
+        edge_set = list(edge_set)
+    return np.unique(edge_keys(edge_set, n_vertices))
+
+def contains_edge_keys(sorted_keys, query_keys):
+    """
+    Vectorized membership test of query keys against a sorted key array.
+    
+    Returns:
+        (Q,) boolean array, True where the query key is in ``sorted_keys``
+    """
+    query_keys = np.asarray(query_keys, dtype=np.int64)
+    if len(sorted_keys) == 0:
+        return np.zeros(query_keys.shape, dtype=bool)
+    pos = np.minimum(np.searchsorted(sorted_keys, query_keys), len(sorted_keys) - 1)
+    return sorted_keys[pos] == query_keys
+
+def dihedral_angles_to_arrays(dihedral_angles):
+    """Split the edge -> angle dictionary into an (E, 2) edge array and an (E,) angle array."""
+    edges = np.array(list(dihedral_angles.keys()), dtype=np.int64).reshape(-1, 2)
+    angles = np.fromiter(dihedral_angles.values(), dtype=np.float64, count=len(dihedral_angles))
+    return edges, angles
+
+def process_obj_file(obj_file, theta0_deg, output_dir, figures_dir, max_render_edges=None):
+    """
+    Load and process a single OBJ file.
+    
+    Used as the worker entry point for batch processing: only the path is
+    sent to the worker process, which loads its own mesh.
+    """
+    mesh_name = os.path.splitext(os.path.basename(obj_file))[0]
+    mesh = load_mesh(obj_file)
+    return process_single_mesh(mesh, theta0_deg, output_dir, figures_dir, mesh_name,
+                               max_render_edges=max_render_edges)
+
+def process_single_mesh(mesh, theta0_deg, output_dir, figures_dir, mesh_name,
+                        max_render_edges=None):
+    """
+    Process a single mesh and generate outputs.
+    
+    max_render_edges caps the number of smooth edges drawn in the heatmaps
+    (None or 0 draws all of them); sharp edges are always drawn.
+    """
+    from packages.preprocessing import (
+        compute_dihedral_angles,
+        detect_sharp_edges,
+        segment_smooth_regions
+    )
+    
     print(f"\n=== Processing {mesh_name} ===")
     
     # Create subdirectories for this mesh
@@ -65,13 +182,17 @@ def process_single_mesh(mesh, theta0_deg, output_dir, figures_dir, mesh_name):
     
     # 4. Generate dihedral angle heatmap visualization
     print("Generating dihedral angle heatmap...")
+    heatmap_data = prepare_heatmap_data(mesh, dihedral_angles, sharp_edges,
+                                        max_smooth_edges=max_render_edges)
     heatmap_path = os.path.join(mesh_figures_dir, f"{mesh_name}_dihedral_heatmap.png")
-    create_dihedral_heatmap(mesh, dihedral_angles, sharp_edges, heatmap_path, theta0_deg)
+    create_dihedral_heatmap(mesh, dihedral_angles, sharp_edges, heatmap_path, theta0_deg,
+                            heatmap_data=heatmap_data)
     
     # 4b. Generate dihedral angle heatmap 4-view visualization
     print("Generating dihedral angle heatmap 4-view...")
     heatmap_4view_path = os.path.join(mesh_figures_dir, f"{mesh_name}_dihedral_heatmap_4view.png")
-    create_dihedral_heatmap_4view(mesh, dihedral_angles, sharp_edges, heatmap_4view_path, theta0_deg)
+    create_dihedral_heatmap_4view(mesh, dihedral_angles, sharp_edges, heatmap_4view_path, theta0_deg,
+                                  heatmap_data=heatmap_data)
     
     # 5. Generate statistics and plots
     print("Generating statistics and plots...")
@@ -106,130 +227,196 @@ def process_single_mesh(mesh, theta0_deg, output_dir, figures_dir, mesh_name):
         'figures_dir': mesh_figures_dir
     }
 
-def create_dihedral_heatmap(mesh, dihedral_angles, sharp_edges, output_path, theta0_deg):
+def get_reusable_figure(figsize):
     """
-    Create a heatmap visualization of dihedral angles on the mesh.
-    Colors edges based on their dihedral angle value, with sharp edges highlighted.
+    Return a cleared figure of the given size, reused across meshes.
+    
+    Args:
+        figsize: (width, height) in inches, also used as the cache key
+    
+    Returns:
+        matplotlib Figure with no axes
+    """
+    plt = get_pyplot()
+    fig = _FIGURE_CACHE.get(figsize)
+    if fig is None or not plt.fignum_exists(fig.number):
+        fig = plt.figure(figsize=figsize)
+        _FIGURE_CACHE[figsize] = fig
+    else:
+        fig.clf()
+    return fig
+
+def prepare_heatmap_data(mesh, dihedral_angles, sharp_edges, max_smooth_edges=None):
+    """
+    Precompute the edge segments, colors and bounds shared by both heatmap renderers.
     
     Args:
         mesh: Trimesh object
         dihedral_angles: Dictionary mapping edge (v1, v2) to angle in degrees
         sharp_edges: Set of edges that are considered sharp (angle >= threshold)
-        output_path: Path to save the visualization
-        theta0_deg: Threshold angle in degrees
-    """
-    # Debug flag
-    debug = True
+        max_smooth_edges: Optional budget of smooth edges to draw; above it a
+            fixed-seed uniform subsample is drawn (sharp edges are never dropped)
     
-    if debug:
-        angles_list = list(dihedral_angles.values())
-        if angles_list:
-            print(f"  Dihedral angles stats: min={np.min(angles_list):.2f}, max={np.max(angles_list):.2f}, mean={np.mean(angles_list):.2f}")
-            # Count sharp edges in dihedral_angles
-            sharp_in_dihedral = sum(1 for edge in sharp_edges if edge in dihedral_angles)
-            print(f"  Sharp edges in dihedral_angles: {sharp_in_dihedral}/{len(sharp_edges)}")
-        else:
-            print("  Dihedral angles dictionary is empty")
+    Returns:
+        Dictionary with the (N, 2, 3) edge segments (smooth first, sharp
+        last), their (N, 4) RGBA colors and (N,) line widths, the (F, 3, 3)
+        surface triangles, and the axis center/half-range
+    """
+    # Debug checks are off by default (CREASE_DEBUG=1 to enable)
+    debug = DEBUG
     
-    # Create a custom colormap: blue (small angle) -> green -> red (large angle)
-    colors = [(0, 0, 1), (0, 1, 0), (1, 0, 0)]  # blue, green, red
-    cmap = LinearSegmentedColormap.from_list('dihedral', colors, N=256)
+    cmap, _ = get_dihedral_colormap()
     
-    # Get edges from mesh (unique edges)
-    edges = mesh.edges_unique
+    # Pull mesh arrays into contiguous locals once (trimesh properties go
+    # through cache validation on every access). trimesh stores indices as
+    # int64; int32 copies halve index bandwidth.
+    vertices = np.ascontiguousarray(mesh.vertices)
+    n_vertices = len(vertices)
+    index_dtype = np.int32 if n_vertices < np.iinfo(np.int32).max else np.int64
+    edges = np.ascontiguousarray(mesh.edges_unique, dtype=index_dtype)
+    faces = np.ascontiguousarray(mesh.faces, dtype=index_dtype)
     
-    # Create a mapping from edge tuple to index in edges array (normalized)
-    edge_to_index = {tuple(sorted(edge)): i for i, edge in enumerate(edges)}
+    # Encode unique edges as int64 keys, and sharp edges as a sorted key set
+    keys = edge_keys(edges, n_vertices)
+    sharp_keys = encode_edge_set(sharp_edges, n_vertices)
     
     # Assign angle values to each edge, default NaN for non-interior edges
     angle_values = np.full(len(edges), np.nan)
-    for edge, angle in dihedral_angles.items():
-        idx = edge_to_index.get(edge)
-        if idx is not None:
-            angle_values[idx] = angle
+    da_edges, da_values = dihedral_angles_to_arrays(dihedral_angles)
+    da_index = lookup_edge_indices(keys, edge_keys(da_edges, n_vertices))
+    da_found = da_index >= 0
+    angle_values[da_index[da_found]] = da_values[da_found]
     
     if debug:
+        if len(da_values):
+            print(f"  Dihedral angles stats: min={da_values.min():.2f}, max={da_values.max():.2f}, mean={da_values.mean():.2f}")
+            # Count sharp edges in dihedral_angles
+            sharp_in_dihedral = int(np.count_nonzero(
+                contains_edge_keys(sharp_keys, edge_keys(da_edges, n_vertices))))
+            print(f"  Sharp edges in dihedral_angles: {sharp_in_dihedral}/{len(sharp_edges)}")
+        else:
+            print("  Dihedral angles dictionary is empty")
+        
         # Edge mapping check
-        found = 0
-        not_found = 0
-        for edge in sharp_edges:
-            idx = edge_to_index.get(edge)
-            if idx is None:
-                not_found += 1
-            else:
-                found += 1
+        sharp_list = list(sharp_edges)
+        sharp_index = lookup_edge_indices(keys, edge_keys(sharp_list, n_vertices))
+        found = int(np.count_nonzero(sharp_index >= 0))
+        not_found = len(sharp_list) - found
         print(f"  Edge mapping: {found} sharp edges found in mapping, {not_found} not found")
         
         # Check a few sharp edges after assignment
         print(f"  Checking first 5 sharp edges after assignment:")
-        for i, edge in enumerate(list(sharp_edges)[:5]):
-            idx = edge_to_index.get(edge)
-            if idx is None:
+        for edge, idx in zip(sharp_list[:5], sharp_index[:5]):
+            if idx < 0:
                 print(f"    Edge {edge} not found in edge_to_index")
             else:
                 print(f"    Edge {edge}: angle={angle_values[idx]:.2f}")
     
     # Calculate equal aspect ratio for 3D axes
-    vertices = mesh.vertices
     min_vals = vertices.min(axis=0)
     max_vals = vertices.max(axis=0)
     mid = (min_vals + max_vals) / 2
     max_range = (max_vals - min_vals).max() / 2
     
+    # Separate sharp and smooth edges with boolean masks over the edge keys
+    sharp_mask = contains_edge_keys(sharp_keys, keys)
+    smooth_mask = ~np.isnan(angle_values) & ~sharp_mask
+    sharp_edge_indices = np.nonzero(sharp_mask)[0]
+    smooth_edge_indices = np.nonzero(smooth_mask)[0]
+    
+    # Dense meshes: draw a representative subset of smooth edges only
+    if max_smooth_edges and len(smooth_edge_indices) > max_smooth_edges:
+        print(f"  Drawing {max_smooth_edges} of {len(smooth_edge_indices)} smooth edges (render budget)")
+        smooth_edge_indices = np.sort(np.random.default_rng(0).choice(
+            smooth_edge_indices, size=max_smooth_edges, replace=False))
+    
+    # Smooth edges: (N, 2, 3) segments gathered in one batched index, (N, 4) RGBA colors
+    smooth_segments = vertices[edges[smooth_edge_indices]]
+    norm_smooth = np.clip(angle_values[smooth_edge_indices] / 360.0, 0, 1)
+    smooth_colors = cmap(norm_smooth)
+    
+    # Sharp edges (drawn on top with thicker lines)
+    sharp_segments = vertices[edges[sharp_edge_indices]]
+    sharp_angles = angle_values[sharp_edge_indices]
+    norm_sharp = np.clip(sharp_angles / 360.0, 0, 1)
+    norm_sharp = np.nan_to_num(norm_sharp, nan=1.0)  # 将NaN替换为1.0（红色）
+    sharp_colors = cmap(norm_sharp)
+    
+    if debug and len(sharp_angles):
+        print(f"  Sharp edges debugging: total {len(sharp_angles)} edges")
+        print(f"  Sharp angles min: {np.nanmin(sharp_angles):.2f}, max: {np.nanmax(sharp_angles):.2f}")
+        print(f"  Norm sharp min: {np.nanmin(norm_sharp):.3f}, max: {np.nanmax(norm_sharp):.3f}")
+        # Print first few angles and corresponding colors
+        for i in range(min(5, len(sharp_angles))):
+            print(f"    Edge {i}: angle={sharp_angles[i]:.2f}, norm={norm_sharp[i]:.3f}, color={sharp_colors[i]}")
+    
+    # Fuse both sets into one draw: smooth first, sharp last so they render on top.
+    # Per-segment alpha lives in the RGBA colors, per-segment width in linewidths.
+    smooth_colors[:, 3] = 0.7
+    sharp_colors[:, 3] = 1.0
+    
+    return {
+        'segments': np.concatenate([smooth_segments, sharp_segments]),
+        'colors': np.concatenate([smooth_colors, sharp_colors]),
+        'linewidths': np.concatenate([np.full(len(smooth_segments), 1.5),
+                                      np.full(len(sharp_segments), 3.0)]),
+        'triangles': vertices[faces],
+        'mid': mid,
+        'max_range': max_range
+    }
+
+def add_heatmap_surface(ax, heatmap_data):
+    """Add the light wireframe background built from the precomputed triangles."""
+    from mpl_toolkits.mplot3d.art3d import Poly3DCollection
+    
+    # Same appearance as plot_trisurf(..., shade=False), without re-triangulating
+    ax.add_collection3d(Poly3DCollection(heatmap_data['triangles'],
+                                         facecolors=(1, 1, 1, 0.05),
+                                         edgecolors='lightgray', linewidths=0.2,
+                                         rasterized=True))
+
+def add_heatmap_edges(ax, heatmap_data):
+    """Add the precomputed edges to a 3D axes as a single collection."""
+    from mpl_toolkits.mplot3d.art3d import Line3DCollection
+    
+    # Collections cannot be shared between axes, but the segment/color buffers can
+    if len(heatmap_data['segments']):
+        ax.add_collection3d(Line3DCollection(heatmap_data['segments'],
+                                             colors=heatmap_data['colors'],
+                                             linewidths=heatmap_data['linewidths'],
+                                             rasterized=True))
+
+def create_dihedral_heatmap(mesh, dihedral_angles, sharp_edges, output_path, theta0_deg,
+                            heatmap_data=None):
+    """
+    Create a heatmap visualization of dihedral angles on the mesh.
+    Colors edges based on their dihedral angle value, with sharp edges highlighted.
+    
+    Args:
+        mesh: Trimesh object
+        dihedral_angles: Dictionary mapping edge (v1, v2) to angle in degrees
+        sharp_edges: Set of edges that are considered sharp (angle >= threshold)
+        output_path: Path to save the visualization
+        theta0_deg: Threshold angle in degrees
+        heatmap_data: Result of prepare_heatmap_data (computed if not given)
+    """
+    plt = get_pyplot()
+    if heatmap_data is None:
+        heatmap_data = prepare_heatmap_data(mesh, dihedral_angles, sharp_edges)
+    
+    _, sm = get_dihedral_colormap()
+    mid = heatmap_data['mid']
+    max_range = heatmap_data['max_range']
+    
     # Create visualization
     fig = plt.figure(figsize=(12, 10))
     ax = fig.add_subplot(111, projection='3d')
     
     # Plot mesh wireframe (light background)
-    ax.plot_trisurf(vertices[:,0], vertices[:,1], vertices[:,2],
-                    triangles=mesh.faces, color=(1, 1, 1, 0.05), 
-                    edgecolor='lightgray', linewidth=0.2, shade=False)
-    
-    # Separate sharp and smooth edges
-    sharp_edge_indices = []
-    smooth_edge_indices = []
-    
-    for i, edge in enumerate(edges):
-        edge_tuple = tuple(edge)
-        if edge_tuple in sharp_edges:
-            sharp_edge_indices.append(i)
-        elif not np.isnan(angle_values[i]):
-            smooth_edge_indices.append(i)
-    
-    # Plot smooth edges first (thinner lines)
-    if smooth_edge_indices:
-        smooth_edges = edges[smooth_edge_indices]
-        smooth_angles = angle_values[smooth_edge_indices]
-        norm_smooth = np.clip(smooth_angles / 360.0, 0, 1)
-        smooth_colors = cmap(norm_smooth)
-        
-        for edge, color in zip(smooth_edges, smooth_colors):
-            v0 = vertices[edge[0]]
-            v1 = vertices[edge[1]]
-            ax.plot([v0[0], v1[0]], [v0[1], v1[1]], [v0[2], v1[2]],
-                    color=color, linewidth=1.5, alpha=0.7, zorder=1)
-    
-    # Plot sharp edges on top (thicker lines, more visible)
-    if sharp_edge_indices:
-        sharp_edges_array = edges[sharp_edge_indices]
-        sharp_angles = angle_values[sharp_edge_indices]
-        norm_sharp = np.clip(sharp_angles / 360.0, 0, 1)
-        norm_sharp = np.nan_to_num(norm_sharp, nan=1.0)  # 将NaN替换为1.0（红色）
-        sharp_colors = cmap(norm_sharp)
-        
-        if debug:
-            print(f"  Sharp edges debugging: total {len(sharp_angles)} edges")
-            print(f"  Sharp angles min: {np.nanmin(sharp_angles):.2f}, max: {np.nanmax(sharp_angles):.2f}")
-            print(f"  Norm sharp min: {np.nanmin(norm_sharp):.3f}, max: {np.nanmax(norm_sharp):.3f}")
-            # Print first few angles and corresponding colors
-            for i in range(min(5, len(sharp_angles))):
-                print(f"    Edge {i}: angle={sharp_angles[i]:.2f}, norm={norm_sharp[i]:.3f}, color={sharp_colors[i]}")
-        
-        for edge, color in zip(sharp_edges_array, sharp_colors):
-            v0 = vertices[edge[0]]
-            v1 = vertices[edge[1]]
-            ax.plot([v0[0], v1[0]], [v0[1], v1[1]], [v0[2], v1[2]],
-                    color=color, linewidth=3.0, alpha=1.0, zorder=2)
+    add_heatmap_surface(ax, heatmap_data)
+    
+    # Plot smooth edges first (thinner lines), then sharp edges on top
+    add_heatmap_edges(ax, heatmap_data)
     
     # Set equal aspect ratio for all axes
     try:
@@ -243,8 +430,6 @@ def create_dihedral_heatmap(mesh, dihedral_angles, sharp_edges, output_path, the
     ax.set_zlim(mid[2] - max_range, mid[2] + max_range)
     
     # Add colorbar
-    sm = plt.cm.ScalarMappable(cmap=cmap, norm=plt.Normalize(vmin=0, vmax=360))
-    sm.set_array([])
     cbar = fig.colorbar(sm, ax=ax, shrink=0.8, pad=0.1)
     cbar.set_label('Dihedral Angle (degrees)', fontsize=12)
     
@@ -263,7 +448,8 @@ def create_dihedral_heatmap(mesh, dihedral_angles, sharp_edges, output_path, the
     print(f"  Saved heatmap to {output_path}")
 
 
-def create_dihedral_heatmap_4view(mesh, dihedral_angles, sharp_edges, output_path, theta0_deg):
+def create_dihedral_heatmap_4view(mesh, dihedral_angles, sharp_edges, output_path, theta0_deg,
+                                  heatmap_data=None, draw_surface=False):
     """
     创建热力图的四视图可视化（正视图、俯视图、侧视图、等轴测视图）。
     
@@ -273,46 +459,19 @@ def create_dihedral_heatmap_4view(mesh, dihedral_angles, sharp_edges, output_pat
         sharp_edges: Set of edges that are considered sharp (angle >= threshold)
         output_path: Path to save the visualization
         theta0_deg: Threshold angle in degrees
+        heatmap_data: prepare_heatmap_data 的结果（未提供时重新计算）
+        draw_surface: 是否绘制浅色网格背景（默认关闭，仅绘制着色边）
     """
-    # 创建自定义颜色映射：蓝色（小角度）-> 绿色 -> 红色（大角度）
-    colors = [(0, 0, 1), (0, 1, 0), (1, 0, 0)]  # blue, green, red
-    cmap = LinearSegmentedColormap.from_list('dihedral', colors, N=256)
-    
-    # 获取网格边
-    edges = mesh.edges_unique
-    
-    # 创建边到索引的映射
-    edge_to_index = {tuple(sorted(edge)): i for i, edge in enumerate(edges)}
-    
-    # 为每条边分配角度值
-    angle_values = np.full(len(edges), np.nan)
-    for edge, angle in dihedral_angles.items():
-        idx = edge_to_index.get(edge)
-        if idx is not None:
-            angle_values[idx] = angle
-    
-    # 获取顶点
-    vertices = mesh.vertices
-    
-    # 计算坐标范围
-    min_vals = vertices.min(axis=0)
-    max_vals = vertices.max(axis=0)
-    mid = (min_vals + max_vals) / 2
-    max_range = (max_vals - min_vals).max() / 2
-    
-    # 分离锐利边和平滑边
-    sharp_edge_indices = []
-    smooth_edge_indices = []
+    plt = get_pyplot()
+    if heatmap_data is None:
+        heatmap_data = prepare_heatmap_data(mesh, dihedral_angles, sharp_edges)
     
-    for i, edge in enumerate(edges):
-        edge_tuple = tuple(edge)
-        if edge_tuple in sharp_edges:
-            sharp_edge_indices.append(i)
-        elif not np.isnan(angle_values[i]):
-            smooth_edge_indices.append(i)
+    _, sm = get_dihedral_colormap()
+    mid = heatmap_data['mid']
+    max_range = heatmap_data['max_range']
     
-    # 创建四视图图形
-    fig = plt.figure(figsize=(16, 12))
+    # 创建四视图图形（复用缓存的 16x12 画布）
+    fig = get_reusable_figure((16, 12))
     
     # 定义四个视角
     views = [
@@ -325,37 +484,12 @@ def create_dihedral_heatmap_4view(mesh, dihedral_angles, sharp_edges, output_pat
     for idx, (title, elev, azim) in enumerate(views, 1):
         ax = fig.add_subplot(2, 2, idx, projection='3d')
         
-        # 绘制网格线框
-        ax.plot_trisurf(vertices[:,0], vertices[:,1], vertices[:,2],
-                        triangles=mesh.faces, color=(1, 1, 1, 0.05), 
-                        edgecolor='lightgray', linewidth=0.2, shade=False)
+        # 绘制网格线框（可选；四个子图共用同一份三角形顶点数组）
+        if draw_surface:
+            add_heatmap_surface(ax, heatmap_data)
         
-        # 绘制平滑边
-        if smooth_edge_indices:
-            smooth_edges = edges[smooth_edge_indices]
-            smooth_angles = angle_values[smooth_edge_indices]
-            norm_smooth = np.clip(smooth_angles / 360.0, 0, 1)
-            smooth_colors = cmap(norm_smooth)
-            
-            for edge, color in zip(smooth_edges, smooth_colors):
-                v0 = vertices[edge[0]]
-                v1 = vertices[edge[1]]
-                ax.plot([v0[0], v1[0]], [v0[1], v1[1]], [v0[2], v1[2]],
-                        color=color, linewidth=1.5, alpha=0.7, zorder=1)
-        
-        # 绘制锐利边
-        if sharp_edge_indices:
-            sharp_edges_array = edges[sharp_edge_indices]
-            sharp_angles = angle_values[sharp_edge_indices]
-            norm_sharp = np.clip(sharp_angles / 360.0, 0, 1)
-            norm_sharp = np.nan_to_num(norm_sharp, nan=1.0)
-            sharp_colors = cmap(norm_sharp)
-            
-            for edge, color in zip(sharp_edges_array, sharp_colors):
-                v0 = vertices[edge[0]]
-                v1 = vertices[edge[1]]
-                ax.plot([v0[0], v1[0]], [v0[1], v1[1]], [v0[2], v1[2]],
-                        color=color, linewidth=3.0, alpha=1.0, zorder=2)
+        # 绘制平滑边与锐利边（共用预计算的线段数组）
+        add_heatmap_edges(ax, heatmap_data)
         
         # 设置等比例
         try:
@@ -382,24 +516,27 @@ def create_dihedral_heatmap_4view(mesh, dihedral_angles, sharp_edges, output_pat
                  fontsize=14, fontweight='bold')
     
     # 添加共享的颜色条
-    sm = plt.cm.ScalarMappable(cmap=cmap, norm=plt.Normalize(vmin=0, vmax=360))
-    sm.set_array([])
     cbar_ax = fig.add_axes([0.92, 0.15, 0.02, 0.7])
     cbar = fig.colorbar(sm, cax=cbar_ax)
     cbar.set_label('Dihedral Angle (degrees)', fontsize=11)
     cbar.ax.axhline(theta0_deg / 360.0, color='black', linestyle='--', linewidth=2,
                     label=f'Threshold ({theta0_deg}°)')
     
-    plt.savefig(output_path, dpi=600, bbox_inches='tight')
-    plt.close()
+    # 16x12 英寸画布使用 400 dpi（像素数约为 600 dpi 的 1/2.25）
+    fig.savefig(output_path, dpi=400, bbox_inches='tight')
+    # 清空而不关闭，下一个网格继续使用该画布
+    fig.clf()
     print(f"  Saved 4-view heatmap to {output_path}")
 
 def generate_statistics(dihedral_angles, sharp_edges, regions, stats_path, plot_path, theta0_deg):
     """
     Generate statistics and histogram of dihedral angles.
     """
-    # Collect angles
-    angles = list(dihedral_angles.values())
+    plt = get_pyplot()
+    
+    # Collect angles into a single ndarray (converted once, reused below)
+    angles = np.fromiter(dihedral_angles.values(), dtype=np.float64, count=len(dihedral_angles))
+    has_angles = angles.size > 0
     
     # Basic statistics
     stats = {
@@ -408,11 +545,11 @@ def generate_statistics(dihedral_angles, sharp_edges, regions, stats_path, plot_
         'num_sharp_edges': len(sharp_edges),
         'num_smooth_regions': len(regions),
         'region_sizes': [len(r) for r in regions],
-        'dihedral_angle_min': float(np.min(angles)) if angles else 0.0,
-        'dihedral_angle_max': float(np.max(angles)) if angles else 0.0,
-        'dihedral_angle_mean': float(np.mean(angles)) if angles else 0.0,
-        'dihedral_angle_median': float(np.median(angles)) if angles else 0.0,
-        'dihedral_angle_std': float(np.std(angles)) if angles else 0.0,
+        'dihedral_angle_min': float(angles.min()) if has_angles else 0.0,
+        'dihedral_angle_max': float(angles.max()) if has_angles else 0.0,
+        'dihedral_angle_mean': float(angles.mean()) if has_angles else 0.0,
+        'dihedral_angle_median': float(np.median(angles)) if has_angles else 0.0,
+        'dihedral_angle_std': float(angles.std()) if has_angles else 0.0,
         'sharp_edge_percentage': (len(sharp_edges) / len(dihedral_angles) * 100) if dihedral_angles else 0.0
     }
     
@@ -424,7 +561,7 @@ def generate_statistics(dihedral_angles, sharp_edges, regions, stats_path, plot_
     # Generate histogram
     fig, ax = plt.subplots(figsize=(10, 6))
     
-    if angles:
+    if has_angles:
         ax.hist(angles, bins=50, alpha=0.7, color='steelblue', edgecolor='black')
         ax.axvline(theta0_deg, color='red', linestyle='--', linewidth=2, label=f'Threshold ({theta0_deg}°)')
         
@@ -455,27 +592,31 @@ Median angle: {stats['dihedral_angle_median']:.1f}°"""
 
 def export_sharp_edges(sharp_edges, dihedral_angles, output_path):
     """Export sharp edges information to CSV file."""
-    with open(output_path, 'w', newline='') as csvfile:
-        writer = csv.writer(csvfile)
-        writer.writerow(['vertex1', 'vertex2', 'dihedral_angle_deg', 'is_sharp'])
-        
-        # Write all interior edges
-        for edge, angle in dihedral_angles.items():
-            is_sharp = edge in sharp_edges
-            writer.writerow([edge[0], edge[1], angle, is_sharp])
+    # Write all interior edges as contiguous columns in one pass
+    edges, angles = dihedral_angles_to_arrays(dihedral_angles)
+    sharp_array = np.array(list(sharp_edges), dtype=np.int64).reshape(-1, 2)
+    n_vertices = max(edges.max(initial=-1), sharp_array.max(initial=-1)) + 1
+    is_sharp = contains_edge_keys(encode_edge_set(sharp_array, n_vertices),
+                                  edge_keys(edges, n_vertices))
+    
+    np.savetxt(output_path,
+               np.column_stack([edges[:, 0], edges[:, 1], angles, is_sharp]),
+               fmt=['%d', '%d', '%.6f', '%d'], delimiter=',',
+               header='vertex1,vertex2,dihedral_angle_deg,is_sharp', comments='')
     
     print(f"  Saved sharp edges to {output_path}")
 
 def export_regions(regions, faces, output_path):
     """Export region information to CSV file."""
-    with open(output_path, 'w', newline='') as csvfile:
-        writer = csv.writer(csvfile)
-        writer.writerow(['region_id', 'face_index', 'vertex1', 'vertex2', 'vertex3'])
-        
-        for region_id, face_indices in enumerate(regions):
-            for face_idx in face_indices:
-                face = faces[face_idx]
-                writer.writerow([region_id, face_idx, face[0], face[1], face[2]])
+    # Flatten regions to (region_id, face_index) rows and gather face vertices once
+    region_ids = np.repeat(np.arange(len(regions)), [len(r) for r in regions])
+    face_indices = np.concatenate(regions).astype(np.int64) if regions else np.empty(0, dtype=np.int64)
+    face_vertices = np.asarray(faces)[face_indices].reshape(-1, 3)
+    
+    np.savetxt(output_path,
+               np.column_stack([region_ids, face_indices, face_vertices]),
+               fmt='%d', delimiter=',',
+               header='region_id,face_index,vertex1,vertex2,vertex3', comments='')
     
     print(f"  Saved region information to {output_path}")
 
@@ -522,6 +663,11 @@ def main():
                         help='Output directory (default: output)')
     parser.add_argument('--figures', '-f', default='figures',
                         help='Directory for figure outputs (default: figures)')
+    parser.add_argument('--workers', '-w', type=int, default=None,
+                        help='Number of worker processes for batch processing (default: number of CPUs)')
+    parser.add_argument('--max-render-edges', type=int, default=200000,
+                        help='Maximum number of smooth edges drawn in the heatmaps; larger meshes are '
+                             'uniformly subsampled, sharp edges are always drawn (0 = no limit, default: 200000)')
     
     args = parser.parse_args()
     
@@ -550,17 +696,27 @@ def main():
     print(f"Found {len(obj_files)} OBJ file(s) to process.")
     print(f"Dihedral angle threshold: {args.threshold} degrees")
     
-    # Process each mesh
-    summary = []
-    for obj_file in obj_files:
-        mesh_name = os.path.splitext(os.path.basename(obj_file))[0]
-        mesh = load_mesh(obj_file)
-        
-        # Process mesh
-        result = process_single_mesh(
-            mesh, args.threshold, args.output, args.figures, mesh_name
-        )
-        summary.append(result)
+    # Process each mesh; meshes are independent, so batches run in a process pool
+    workers = min(args.workers or os.cpu_count() or 1, len(obj_files))
+    if workers <= 1:
+        summary = [
+            process_obj_file(obj_file, args.threshold, args.output, args.figures,
+                             args.max_render_edges)
+            for obj_file in obj_files
+        ]
+    else:
+        print(f"Processing with {workers} worker processes.")
+        summary = [None] * len(obj_files)
+        with ProcessPoolExecutor(max_workers=workers,
+                                 mp_context=multiprocessing.get_context('spawn')) as executor:
+            futures = {
+                executor.submit(process_obj_file, obj_file, args.threshold,
+                                args.output, args.figures, args.max_render_edges): i
+                for i, obj_file in enumerate(obj_files)
+            }
+            for future in as_completed(futures):
+                # Keep the summary in input order regardless of completion order
+                summary[futures[future]] = future.result()
     
     # Generate overall summary
     print("\n" + "="*60)
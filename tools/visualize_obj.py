@@ -11,23 +11,59 @@ import numpy as np
 import trimesh
 import matplotlib.pyplot as plt
 from matplotlib.colors import LinearSegmentedColormap
-
-# 设置全局字体为Times
-plt.rcParams['font.family'] = 'serif'
-plt.rcParams['font.serif'] = ['Times New Roman']
-plt.rcParams['axes.unicode_minus'] = False
+from mpl_toolkits.mplot3d.art3d import Line3DCollection, Poly3DCollection
 
 # Add project root to path to import packages
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+from packages.plotting import (
+    PNG_SAVE_KWARGS, compute_bounds, get_plot_arrays, resolve_serif_font)
+from packages.topology import decode_edge_keys, edge_keys
+
+# 设置全局字体为Times（启动时解析一次）
+plt.rcParams['font.family'] = 'serif'
+plt.rcParams['font.serif'] = [resolve_serif_font()]
+plt.rcParams['axes.unicode_minus'] = False
+
 
 def load_mesh(obj_path):
-    """加载OBJ文件"""
-    mesh = trimesh.load(obj_path, force='mesh')
+    """加载OBJ文件（跳过材质/贴图加载，只需要几何）"""
+    mesh = trimesh.load(obj_path, force='mesh', skip_materials=True)
     return mesh
 
 
-def visualize_mesh_simple(mesh, output_path=None, title=None):
+def compute_unique_edges(faces):
+    """
+    计算网格的唯一边（排序 + np.unique，不触发 trimesh 的连通性缓存）
+    
+    Args:
+        faces: (F, 3) 面片索引数组
+    
+    Returns:
+        edges: (E, 2) 唯一边数组，每行端点升序
+    """
+    faces = np.asarray(faces)
+    n_vertices = int(faces.max()) + 1
+    
+    # 编码成一维边键去重，比按行 np.unique(axis=0) 快得多
+    keys = np.unique(edge_keys(faces[:, [[0, 1], [1, 2], [2, 0]]], n_vertices))
+    return decode_edge_keys(keys, n_vertices, faces.dtype)
+
+
+def add_mesh_surface(ax, triangles):
+    """
+    在 3D 坐标轴上绘制网格表面（浅灰色面片 + 深蓝色边线，带光照着色）
+    
+    Args:
+        ax: 3D 坐标轴
+        triangles: (F, 3, 3) 三角形顶点数组（可在多个子图间共用）
+    """
+    ax.add_collection3d(Poly3DCollection(triangles, facecolors='lightgray',
+                                         edgecolor='darkblue', linewidth=0.5,
+                                         alpha=0.8, shade=True))
+
+
+def visualize_mesh_simple(mesh, output_path=None, title=None, dpi=300):
     """
     简单可视化网格模型（仅显示线框）
     
@@ -35,22 +71,18 @@ def visualize_mesh_simple(mesh, output_path=None, title=None):
         mesh: Trimesh对象
         output_path: 输出图片路径（可选）
         title: 图表标题（可选）
+        dpi: 输出图片分辨率
     """
-    vertices = mesh.vertices
+    vertices, faces = get_plot_arrays(mesh)
     
     # 计算等比例范围
-    min_vals = vertices.min(axis=0)
-    max_vals = vertices.max(axis=0)
-    mid = (min_vals + max_vals) / 2
-    max_range = (max_vals - min_vals).max() / 2
+    mid, max_range = compute_bounds(vertices)
     
     fig = plt.figure(figsize=(10, 10))
     ax = fig.add_subplot(111, projection='3d')
     
-    # 绘制网格表面
-    ax.plot_trisurf(vertices[:, 0], vertices[:, 1], vertices[:, 2],
-                    triangles=mesh.faces, color='lightgray', 
-                    edgecolor='darkblue', linewidth=0.5, alpha=0.8)
+    # 绘制网格表面（直接使用 (F, 3, 3) 三角形顶点数组）
+    add_mesh_surface(ax, vertices[faces])
     
     # 设置等比例
     try:
@@ -72,7 +104,7 @@ def visualize_mesh_simple(mesh, output_path=None, title=None):
     ax.set_zlabel('Z', fontsize=11)
     
     if output_path:
-        plt.savefig(output_path, dpi=600, bbox_inches='tight')
+        plt.savefig(output_path, dpi=dpi, bbox_inches='tight', pil_kwargs=PNG_SAVE_KWARGS)
         print(f"Saved visualization to {output_path}")
     else:
         plt.show()
@@ -80,7 +112,7 @@ def visualize_mesh_simple(mesh, output_path=None, title=None):
     plt.close()
 
 
-def visualize_mesh_4view(mesh, output_path=None, title=None):
+def visualize_mesh_4view(mesh, output_path=None, title=None, dpi=300):
     """
     四视图可视化网格模型（正视图、俯视图、侧视图、等轴测视图）
     
@@ -88,14 +120,15 @@ def visualize_mesh_4view(mesh, output_path=None, title=None):
         mesh: Trimesh对象
         output_path: 输出图片路径（可选）
         title: 图表标题（可选）
+        dpi: 输出图片分辨率
     """
-    vertices = mesh.vertices
+    vertices, faces = get_plot_arrays(mesh)
     
     # 计算等比例范围
-    min_vals = vertices.min(axis=0)
-    max_vals = vertices.max(axis=0)
-    mid = (min_vals + max_vals) / 2
-    max_range = (max_vals - min_vals).max() / 2
+    mid, max_range = compute_bounds(vertices)
+    
+    # 三角形顶点数组只构建一次，四个子图共用
+    triangles = vertices[faces]
     
     fig = plt.figure(figsize=(16, 12))
     
@@ -111,9 +144,7 @@ def visualize_mesh_4view(mesh, output_path=None, title=None):
         ax = fig.add_subplot(2, 2, idx, projection='3d')
         
         # 绘制网格表面
-        ax.plot_trisurf(vertices[:, 0], vertices[:, 1], vertices[:, 2],
-                        triangles=mesh.faces, color='lightgray', 
-                        edgecolor='darkblue', linewidth=0.5, alpha=0.8)
+        add_mesh_surface(ax, triangles)
         
         # 设置等比例
         try:
@@ -140,7 +171,7 @@ def visualize_mesh_4view(mesh, output_path=None, title=None):
         fig.suptitle('Mesh Visualization - 4 Views', fontsize=14, fontweight='bold')
     
     if output_path:
-        plt.savefig(output_path, dpi=600, bbox_inches='tight')
+        plt.savefig(output_path, dpi=dpi, bbox_inches='tight', pil_kwargs=PNG_SAVE_KWARGS)
         print(f"Saved 4-view visualization to {output_path}")
     else:
         plt.show()
@@ -148,7 +179,8 @@ def visualize_mesh_4view(mesh, output_path=None, title=None):
     plt.close()
 
 
-def visualize_mesh_with_edges(mesh, output_path=None, title=None, edge_color='red', edge_width=2.0):
+def visualize_mesh_with_edges(mesh, output_path=None, title=None, edge_color='red', edge_width=2.0,
+                              edges=None, dpi=300):
     """
     可视化网格模型并高亮显示边
     
@@ -158,30 +190,27 @@ def visualize_mesh_with_edges(mesh, output_path=None, title=None, edge_color='re
         title: 图表标题（可选）
         edge_color: 边的颜色
         edge_width: 边的线宽
+        edges: 预先计算的 (E, 2) 唯一边数组（可选，默认由 compute_unique_edges 计算）
+        dpi: 输出图片分辨率
     """
-    vertices = mesh.vertices
-    edges = mesh.edges_unique
+    vertices, faces = get_plot_arrays(mesh)
+    if edges is None:
+        edges = compute_unique_edges(faces)
     
     # 计算等比例范围
-    min_vals = vertices.min(axis=0)
-    max_vals = vertices.max(axis=0)
-    mid = (min_vals + max_vals) / 2
-    max_range = (max_vals - min_vals).max() / 2
+    mid, max_range = compute_bounds(vertices)
     
     fig = plt.figure(figsize=(12, 10))
     ax = fig.add_subplot(111, projection='3d')
     
     # 绘制网格表面（浅色背景）
-    ax.plot_trisurf(vertices[:, 0], vertices[:, 1], vertices[:, 2],
-                    triangles=mesh.faces, color=(1, 1, 1, 0.1), 
-                    edgecolor='lightgray', linewidth=0.2, shade=False)
+    ax.add_collection3d(Poly3DCollection(vertices[faces], facecolors=(1, 1, 1, 0.1),
+                                         edgecolor='lightgray', linewidth=0.2, shade=False))
     
-    # 绘制所有边
-    for edge in edges:
-        v0 = vertices[edge[0]]
-        v1 = vertices[edge[1]]
-        ax.plot([v0[0], v1[0]], [v0[1], v1[1]], [v0[2], v1[2]],
-                color=edge_color, linewidth=edge_width, alpha=0.8)
+    # 绘制所有边（单个 Line3DCollection，线段数组形状为 (E, 2, 3)）
+    segments = vertices[edges]
+    ax.add_collection3d(Line3DCollection(segments, colors=edge_color,
+                                         linewidths=edge_width, alpha=0.8))
     
     # 设置等比例
     try:
@@ -203,7 +232,7 @@ def visualize_mesh_with_edges(mesh, output_path=None, title=None, edge_color='re
     ax.set_zlabel('Z', fontsize=11)
     
     if output_path:
-        plt.savefig(output_path, dpi=600, bbox_inches='tight')
+        plt.savefig(output_path, dpi=dpi, bbox_inches='tight', pil_kwargs=PNG_SAVE_KWARGS)
         print(f"Saved visualization to {output_path}")
     else:
         plt.show()
@@ -211,12 +240,15 @@ def visualize_mesh_with_edges(mesh, output_path=None, title=None, edge_color='re
     plt.close()
 
 
-def print_mesh_info(mesh, mesh_name="Mesh"):
-    """打印网格信息"""
+def print_mesh_info(mesh, mesh_name="Mesh", edges=None):
+    """打印网格信息（edges 为预先计算的唯一边数组，可选）"""
+    if edges is None:
+        edges = compute_unique_edges(mesh.faces)
+    
     print(f"\n=== {mesh_name} Information ===")
     print(f"  Vertices: {len(mesh.vertices)}")
     print(f"  Faces: {len(mesh.faces)}")
-    print(f"  Edges: {len(mesh.edges_unique)}")
+    print(f"  Edges: {len(edges)}")
     
     # 计算包围盒
     min_vals = mesh.vertices.min(axis=0)
@@ -250,6 +282,8 @@ def main():
                         help='Custom title for the visualization')
     parser.add_argument('--info', action='store_true',
                         help='Print mesh information')
+    parser.add_argument('--dpi', type=int, default=300,
+                        help='Resolution of the saved image (default: 300)')
     
     args = parser.parse_args()
     
@@ -267,9 +301,12 @@ def main():
     mesh = load_mesh(args.input)
     mesh_name = os.path.splitext(os.path.basename(args.input))[0]
     
+    # 唯一边只计算一次（网格信息与 edges 模式共用）
+    edges = compute_unique_edges(mesh.faces) if (args.info or args.mode == 'edges') else None
+    
     # 打印网格信息
     if args.info:
-        print_mesh_info(mesh, mesh_name)
+        print_mesh_info(mesh, mesh_name, edges=edges)
     
     # 设置标题
     title = args.title if args.title else f'{mesh_name} Visualization'
@@ -278,11 +315,12 @@ def main():
     print(f"Generating {args.mode} visualization...")
     
     if args.mode == 'simple':
-        visualize_mesh_simple(mesh, output_path=args.output, title=title)
+        visualize_mesh_simple(mesh, output_path=args.output, title=title, dpi=args.dpi)
     elif args.mode == '4view':
-        visualize_mesh_4view(mesh, output_path=args.output, title=title)
+        visualize_mesh_4view(mesh, output_path=args.output, title=title, dpi=args.dpi)
     elif args.mode == 'edges':
-        visualize_mesh_with_edges(mesh, output_path=args.output, title=title)
+        visualize_mesh_with_edges(mesh, output_path=args.output, title=title, edges=edges,
+                                  dpi=args.dpi)
     
     print("Done!")
 
@@ -5,21 +5,54 @@ Regions 可视化工具
 """
 
 import argparse
+import multiprocessing
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 import trimesh
 import matplotlib.pyplot as plt
-from matplotlib.colors import LinearSegmentedColormap
-import csv
+from matplotlib.colors import LightSource
+from mpl_toolkits.mplot3d.art3d import Line3DCollection, Poly3DCollection
 
-# 设置全局字体为Times
+# Add project root to path to import packages
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from packages.plotting import (
+    PNG_SAVE_KWARGS, compute_bounds, get_plot_arrays, resolve_serif_font)
+from packages.topology import decode_edge_keys, edge_keys
+
+# 设置全局字体为Times（启动时解析一次）
 plt.rcParams['font.family'] = 'serif'
-plt.rcParams['font.serif'] = ['Times New Roman']
+plt.rcParams['font.serif'] = [resolve_serif_font()]
 plt.rcParams['axes.unicode_minus'] = False
 
-# Add project root to path to import packages
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# 并行渲染时子进程持有的网格数组（由 _init_region_worker 设置，避免每个任务重复序列化网格）
+_WORKER_VERTICES = None
+_WORKER_FACES = None
+_WORKER_BACKGROUND_FACES = None
+
+# 每个进程复用的画布缓存：mode -> (fig, axes, faces)，faces 为背景所属网格的面片数组
+_CANVAS_CACHE = {}
+
+# 网格全局边索引缓存：(faces, unique_edges, halfedge_edges)，见 get_mesh_edge_index
+_EDGE_INDEX_CACHE = None
+
+# 网格面片光照系数缓存：(vertices, faces, face_shade)，见 get_mesh_face_shading
+_FACE_SHADE_CACHE = None
+
+# 与 matplotlib 3D 着色默认值相同的光源方向
+LIGHT_DIRECTION = LightSource(azdeg=225, altdeg=19.4712).direction
+
+# 各模式下整个网格背景线框的样式
+BACKGROUND_STYLES = {
+    'simple': {'linewidth': 0.2, 'alpha': 0.3},
+    '4view': {'linewidth': 0.15, 'alpha': 0.25},
+}
+
+# 背景面片数达到该值时栅格化背景：写 PDF 时每页嵌入一张位图而不是全部背景三角形的矢量。
+# 面片较少时矢量反而更小（半透明背景的 alpha 蒙版难以压缩），PNG 输出不受影响
+RASTERIZE_BACKGROUND_MIN_FACES = 30000
 
 
 def load_regions_from_csv(csv_path):
@@ -27,96 +60,182 @@ def load_regions_from_csv(csv_path):
     从 CSV 文件加载 region 信息
     
     Returns:
-        regions: dict, key 为 region_id, value 为 face_index 列表
+        regions: dict, key 为 region_id, value 为 face_index 数组
     """
-    regions = {}
     with open(csv_path, 'r') as csvfile:
-        reader = csv.DictReader(csvfile)
-        for row in reader:
-            region_id = int(row['region_id'])
-            face_idx = int(row['face_index'])
-            if region_id not in regions:
-                regions[region_id] = []
-            regions[region_id].append(face_idx)
-    return regions
-
-
-def visualize_region(mesh, face_indices, region_id, output_path=None, 
-                     highlight_edges=True, edge_color='red', edge_width=2.0):
+        # 按表头定位列，只解析需要的两列
+        header = [name.strip() for name in csvfile.readline().split(',')]
+        usecols = (header.index('region_id'), header.index('face_index'))
+        data = np.loadtxt(csvfile, delimiter=',', usecols=usecols, dtype=np.int64, ndmin=2)
+    
+    region_ids, face_indices = data[:, 0], data[:, 1]
+    
+    # 稳定排序后按 region_id 切分，region 内保持 CSV 中的面片顺序
+    order = np.argsort(region_ids, kind='stable')
+    region_ids = region_ids[order]
+    face_indices = face_indices[order]
+    unique_ids, starts = np.unique(region_ids, return_index=True)
+    
+    return {int(region_id): group
+            for region_id, group in zip(unique_ids, np.split(face_indices, starts[1:]))}
+
+
+def get_region_canvas(mode, vertices, faces):
     """
-    可视化单个 region
+    获取当前进程复用的画布（按可视化模式缓存，跨 region 只创建一次）
+    
+    整个网格的浅色背景线框在创建画布时绘制一次并常驻于坐标轴中，
+    各 region 只在其上叠加自己的图元，保存后再移除。
     
     Args:
-        mesh: Trimesh 对象（原始完整网格）
-        face_indices: 该 region 包含的面片索引列表
-        region_id: region 的 ID
-        output_path: 输出图片路径
-        highlight_edges: 是否高亮显示 region 的边界边
-        edge_color: 边界边颜色
-        edge_width: 边界边线宽
+        mode: 'simple' 或 '4view'
+        vertices: (V, 3) 顶点数组（原始完整网格）
+        faces: (F, 3) 面片索引数组（原始完整网格）
+    
+    Returns:
+        fig: Figure 对象
+        axes: 3D 坐标轴列表（simple 为 1 个，4view 为 4 个）
     """
-    vertices = mesh.vertices
-    faces = mesh.faces
+    canvas = _CANVAS_CACHE.get(mode)
+    if canvas is not None and canvas[2] is faces:
+        return canvas[0], canvas[1]
+    if canvas is not None:
+        # 换了网格，旧背景失效
+        plt.close(canvas[0])
+    
+    if mode == '4view':
+        fig = plt.figure(figsize=(16, 12))
+        axes = [fig.add_subplot(2, 2, idx, projection='3d') for idx in range(1, 5)]
+    else:
+        fig = plt.figure(figsize=(10, 10))
+        axes = [fig.add_subplot(111, projection='3d')]
+    
+    style = BACKGROUND_STYLES.get(mode, BACKGROUND_STYLES['simple'])
+    rasterized = len(faces) >= RASTERIZE_BACKGROUND_MIN_FACES
+    # 整个网格的三角形顶点数组 (F, 3, 3)，所有子图共用
+    triangles = vertices[faces]
+    for ax in axes:
+        # 绘制整个网格的浅色线框作为背景
+        ax.add_collection3d(Poly3DCollection(triangles, facecolors=(0.9, 0.9, 0.9, 0.3),
+                                             edgecolor='lightgray', linewidth=style['linewidth'],
+                                             alpha=style['alpha'], shade=False, rasterized=rasterized))
+        
+        # 设置等比例
+        try:
+            ax.set_box_aspect([1, 1, 1])
+        except AttributeError:
+            pass
     
-    # 获取 region 的面片
-    region_faces = faces[face_indices]
+    _CANVAS_CACHE[mode] = (fig, axes, faces)
+    return fig, axes
+
+
+def close_region_canvases():
+    """关闭当前进程缓存的所有画布"""
+    for fig, _, _ in _CANVAS_CACHE.values():
+        plt.close(fig)
+    _CANVAS_CACHE.clear()
+
+
+def render_region_into(ax, region_triangles, region_facecolors, mid, max_range,
+                       boundary_segments=None, edge_color='red', edge_width=2.0,
+                       region_linewidth=0.8):
+    """
+    在已绘制背景的 3D 坐标轴上叠加单个 region
     
-    # 计算 region 的顶点（用于设置视角范围）
-    region_vertex_indices = np.unique(region_faces.flatten())
-    region_vertices = vertices[region_vertex_indices]
+    Args:
+        ax: get_region_canvas 返回的 3D 坐标轴
+        region_triangles: (K, 3, 3) region 面片的三角形顶点数组
+        region_facecolors: (K, 4) 已着色的 region 面片颜色
+        mid: 视角范围中心
+        max_range: 视角范围半边长
+        boundary_segments: (B, 2, 3) 边界边线段数组（None 表示不绘制）
+        edge_color: 边界边颜色
+        edge_width: 边界边线宽
+        region_linewidth: region 面片边线线宽
     
-    # 计算 region 的包围盒
-    min_vals = region_vertices.min(axis=0)
-    max_vals = region_vertices.max(axis=0)
-    mid = (min_vals + max_vals) / 2
-    max_range = (max_vals - min_vals).max() / 2
+    Returns:
+        artists: 本次新增的图元列表，保存图片后需调用 remove_region_artists 移除
+    """
+    # 绘制 region 的面片（使用醒目的颜色，光照已预先计算）
+    surface = Poly3DCollection(region_triangles, facecolors=region_facecolors,
+                               edgecolor='darkblue', linewidth=region_linewidth,
+                               alpha=0.9, shade=False)
+    ax.add_collection3d(surface)
+    artists = [surface]
+    
+    # 高亮边界边
+    if boundary_segments is not None:
+        edges = Line3DCollection(boundary_segments, colors=edge_color,
+                                 linewidths=edge_width, alpha=1.0)
+        ax.add_collection3d(edges)
+        artists.append(edges)
+    
+    # 设置视角范围（以 region 为中心，添加 20% 边距）
+    margin = max_range * 0.2
+    ax.set_xlim(mid[0] - max_range - margin, mid[0] + max_range + margin)
+    ax.set_ylim(mid[1] - max_range - margin, mid[1] + max_range + margin)
+    ax.set_zlim(mid[2] - max_range - margin, mid[2] + max_range + margin)
     
-    # 如果没有有效范围，使用整个网格的范围
-    if max_range < 1e-6:
-        min_vals = vertices.min(axis=0)
-        max_vals = vertices.max(axis=0)
-        mid = (min_vals + max_vals) / 2
-        max_range = (max_vals - min_vals).max() / 2
+    return artists
+
+
+def remove_region_artists(artists):
+    """移除 render_region_into 添加的图元，保留常驻的背景"""
+    for artist in artists:
+        artist.remove()
+
+
+def prepare_region(vertices, faces, face_indices, region_id, highlight_edges=True):
+    """
+    计算绘制单个 region 所需的数据
     
-    fig = plt.figure(figsize=(10, 10))
-    ax = fig.add_subplot(111, projection='3d')
+    Returns:
+        region_triangles: (K, 3, 3) region 面片的三角形顶点数组
+        region_facecolors: (K, 4) 按面片光照着色后的 region 颜色（tab20）
+        mid, max_range: 视角范围
+        boundary_segments: (B, 2, 3) 边界边线段数组，不高亮或无边界时为 None
+    """
+    # 面片、包围盒与边界边一次求出
+    region_triangles, boundary_edges, mid, max_range = get_region_boundary_and_bounds(
+        vertices, faces, face_indices, with_boundary=highlight_edges)
+    boundary_segments = vertices[boundary_edges] if len(boundary_edges) > 0 else None
     
-    # 绘制整个网格的浅色线框作为背景
-    ax.plot_trisurf(vertices[:, 0], vertices[:, 1], vertices[:, 2],
-                    triangles=faces, color=(0.9, 0.9, 0.9, 0.3), 
-                    edgecolor='lightgray', linewidth=0.2, alpha=0.3, shade=False)
+    # 使用 tab20 颜色映射来区分不同的 region，按预计算的面片光照系数着色
+    region_color = np.asarray(plt.cm.tab20(region_id % 20))
+    region_facecolors = np.tile(region_color, (len(region_triangles), 1))
+    region_facecolors[:, :3] *= get_mesh_face_shading(vertices, faces)[face_indices, None]
     
-    # 绘制 region 的面片（使用醒目的颜色）
-    # 使用 tab20 颜色映射来区分不同的 region
-    color_map = plt.cm.tab20
-    region_color = color_map(region_id % 20)
+    return region_triangles, region_facecolors, mid, max_range, boundary_segments
+
+
+def visualize_region(vertices, faces, face_indices, region_id, output_path=None, 
+                     highlight_edges=True, edge_color='red', edge_width=2.0, dpi=150,
+                     background_faces=None, pdf=None):
+    """
+    可视化单个 region
     
-    ax.plot_trisurf(vertices[:, 0], vertices[:, 1], vertices[:, 2],
-                    triangles=region_faces, color=region_color, 
-                    edgecolor='darkblue', linewidth=0.8, alpha=0.9, shade=True)
+    Args:
+        vertices: (V, 3) 顶点数组（原始完整网格）
+        faces: (F, 3) 面片索引数组（原始完整网格）
+        face_indices: 该 region 包含的面片索引列表
+        region_id: region 的 ID
+        output_path: 输出图片路径
+        highlight_edges: 是否高亮显示 region 的边界边
+        edge_color: 边界边颜色
+        edge_width: 边界边线宽
+        dpi: 输出图片分辨率
+        background_faces: 背景线框使用的面片（默认使用完整的 faces）
+        pdf: PdfPages 对象（可选，提供时把该 region 追加为 PDF 的一页）
+    """
+    region_triangles, region_facecolors, mid, max_range, boundary_segments = prepare_region(
+        vertices, faces, face_indices, region_id, highlight_edges)
     
-    # 如果需要，高亮显示 region 的边界边
-    if highlight_edges:
-        # 找到 region 的边界边
-        boundary_edges = get_region_boundary_edges(mesh, face_indices)
-        
-        for edge in boundary_edges:
-            v0 = vertices[edge[0]]
-            v1 = vertices[edge[1]]
-            ax.plot([v0[0], v1[0]], [v0[1], v1[1]], [v0[2], v1[2]],
-                    color=edge_color, linewidth=edge_width, alpha=1.0)
-    
-    # 设置等比例
-    try:
-        ax.set_box_aspect([1, 1, 1])
-    except AttributeError:
-        pass
-    
-    # 设置视角范围（以 region 为中心）
-    margin = max_range * 0.2  # 添加 20% 边距
-    ax.set_xlim(mid[0] - max_range - margin, mid[0] + max_range + margin)
-    ax.set_ylim(mid[1] - max_range - margin, mid[1] + max_range + margin)
-    ax.set_zlim(mid[2] - max_range - margin, mid[2] + max_range + margin)
+    # 复用缓存的画布（背景已常驻）
+    fig, (ax,) = get_region_canvas('simple', vertices,
+                                   faces if background_faces is None else background_faces)
+    artists = render_region_into(ax, region_triangles, region_facecolors, mid, max_range,
+                                 boundary_segments, edge_color=edge_color, edge_width=edge_width)
     
     # 设置标题
     ax.set_title(f'Region {region_id} ({len(face_indices)} faces)', fontsize=14, fontweight='bold')
@@ -124,58 +243,41 @@ def visualize_region(mesh, face_indices, region_id, output_path=None,
     ax.set_ylabel('Y', fontsize=11)
     ax.set_zlabel('Z', fontsize=11)
     
+    if pdf is not None:
+        pdf.savefig(fig, dpi=dpi, bbox_inches='tight')
     if output_path:
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
+        fig.savefig(output_path, dpi=dpi, bbox_inches='tight', pil_kwargs=PNG_SAVE_KWARGS)
         print(f"  Saved region {region_id} visualization to {output_path}")
     
-    plt.close()
+    remove_region_artists(artists)
 
 
-def visualize_region_4view(mesh, face_indices, region_id, output_path=None,
-                           highlight_edges=True, edge_color='red', edge_width=2.0):
+def visualize_region_4view(vertices, faces, face_indices, region_id, output_path=None,
+                           highlight_edges=True, edge_color='red', edge_width=2.0, dpi=150,
+                           background_faces=None, pdf=None):
     """
     四视图可视化单个 region（正视图、俯视图、侧视图、等轴测视图）
     
     Args:
-        mesh: Trimesh 对象（原始完整网格）
+        vertices: (V, 3) 顶点数组（原始完整网格）
+        faces: (F, 3) 面片索引数组（原始完整网格）
         face_indices: 该 region 包含的面片索引列表
         region_id: region 的 ID
         output_path: 输出图片路径
         highlight_edges: 是否高亮显示 region 的边界边
         edge_color: 边界边颜色
         edge_width: 边界边线宽
+        dpi: 输出图片分辨率
+        background_faces: 背景线框使用的面片（默认使用完整的 faces）
+        pdf: PdfPages 对象（可选，提供时把该 region 追加为 PDF 的一页）
     """
-    vertices = mesh.vertices
-    faces = mesh.faces
-    
-    # 获取 region 的面片
-    region_faces = faces[face_indices]
-    
-    # 计算 region 的顶点（用于设置视角范围）
-    region_vertex_indices = np.unique(region_faces.flatten())
-    region_vertices = vertices[region_vertex_indices]
+    region_triangles, region_facecolors, mid, max_range, boundary_segments = prepare_region(
+        vertices, faces, face_indices, region_id, highlight_edges)
     
-    # 计算 region 的包围盒
-    min_vals = region_vertices.min(axis=0)
-    max_vals = region_vertices.max(axis=0)
-    mid = (min_vals + max_vals) / 2
-    max_range = (max_vals - min_vals).max() / 2
-    
-    # 如果没有有效范围，使用整个网格的范围
-    if max_range < 1e-6:
-        min_vals = vertices.min(axis=0)
-        max_vals = vertices.max(axis=0)
-        mid = (min_vals + max_vals) / 2
-        max_range = (max_vals - min_vals).max() / 2
-    
-    # 获取边界边
-    boundary_edges = get_region_boundary_edges(mesh, face_indices) if highlight_edges else []
-    
-    # 创建颜色
-    color_map = plt.cm.tab20
-    region_color = color_map(region_id % 20)
-    
-    fig = plt.figure(figsize=(16, 12))
+    # 复用缓存的画布（四个子图，背景已常驻；四个子图共用同一份 region 三角形数组）
+    fig, axes = get_region_canvas('4view', vertices,
+                                  faces if background_faces is None else background_faces)
+    artists = []
     
     # 定义四个视角
     views = [
@@ -185,38 +287,10 @@ def visualize_region_4view(mesh, face_indices, region_id, output_path=None,
         ('Isometric View', 30, 45),             # 等轴测视图
     ]
     
-    for idx, (view_title, elev, azim) in enumerate(views, 1):
-        ax = fig.add_subplot(2, 2, idx, projection='3d')
-        
-        # 绘制整个网格的浅色线框作为背景
-        ax.plot_trisurf(vertices[:, 0], vertices[:, 1], vertices[:, 2],
-                        triangles=faces, color=(0.9, 0.9, 0.9, 0.3), 
-                        edgecolor='lightgray', linewidth=0.15, alpha=0.25, shade=False)
-        
-        # 绘制 region 的面片
-        ax.plot_trisurf(vertices[:, 0], vertices[:, 1], vertices[:, 2],
-                        triangles=region_faces, color=region_color, 
-                        edgecolor='darkblue', linewidth=0.6, alpha=0.9, shade=True)
-        
-        # 高亮边界边
-        if highlight_edges:
-            for edge in boundary_edges:
-                v0 = vertices[edge[0]]
-                v1 = vertices[edge[1]]
-                ax.plot([v0[0], v1[0]], [v0[1], v1[1]], [v0[2], v1[2]],
-                        color=edge_color, linewidth=edge_width, alpha=1.0)
-        
-        # 设置等比例
-        try:
-            ax.set_box_aspect([1, 1, 1])
-        except AttributeError:
-            pass
-        
-        # 设置视角范围
-        margin = max_range * 0.2
-        ax.set_xlim(mid[0] - max_range - margin, mid[0] + max_range + margin)
-        ax.set_ylim(mid[1] - max_range - margin, mid[1] + max_range + margin)
-        ax.set_zlim(mid[2] - max_range - margin, mid[2] + max_range + margin)
+    for ax, (view_title, elev, azim) in zip(axes, views):
+        artists += render_region_into(ax, region_triangles, region_facecolors, mid, max_range,
+                                      boundary_segments, edge_color=edge_color,
+                                      edge_width=edge_width, region_linewidth=0.6)
         
         # 设置视角
         ax.view_init(elev=elev, azim=azim)
@@ -230,59 +304,187 @@ def visualize_region_4view(mesh, face_indices, region_id, output_path=None,
     fig.suptitle(f'Region {region_id} - 4 Views ({len(face_indices)} faces)', 
                  fontsize=14, fontweight='bold')
     
+    if pdf is not None:
+        pdf.savefig(fig, dpi=dpi, bbox_inches='tight')
     if output_path:
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
+        fig.savefig(output_path, dpi=dpi, bbox_inches='tight', pil_kwargs=PNG_SAVE_KWARGS)
         print(f"  Saved region {region_id} 4-view visualization to {output_path}")
     
-    plt.close()
+    remove_region_artists(artists)
+
+
+def select_background_faces(faces, max_faces=None):
+    """
+    挑选用于浅色背景线框的面片：超过预算时均匀随机抽样（固定随机种子，结果可复现）
+    
+    背景只作为位置参考，region 面片和边界边仍然使用完整网格绘制。
+    
+    Args:
+        faces: (F, 3) 面片索引数组
+        max_faces: 背景面片数量上限（None 或 0 表示不限制）
+    
+    Returns:
+        background_faces: (min(F, max_faces), 3) 面片索引数组
+    """
+    if not max_faces or len(faces) <= max_faces:
+        return faces
+    keep = np.sort(np.random.default_rng(0).choice(len(faces), size=max_faces, replace=False))
+    return faces[keep]
+
+
+def get_mesh_edge_index(faces):
+    """
+    获取整个网格的边索引（每个网格在每个进程中只计算一次，所有 region 共用）
+    
+    Args:
+        faces: (F, 3) 面片索引数组
+    
+    Returns:
+        unique_edges: (E, 2) 唯一边数组，每行端点升序
+        halfedge_edges: (3F,) 第 f 个面片的第 k 条边（下标 3f + k）对应的唯一边编号
+    """
+    global _EDGE_INDEX_CACHE
+    if _EDGE_INDEX_CACHE is None or _EDGE_INDEX_CACHE[0] is not faces:
+        # 面片的三条边 (F, 3, 2) -> (3F,) 一维边键，比按行 np.unique(axis=0) 快得多
+        n_vertices = int(faces.max()) + 1
+        keys = edge_keys(faces[:, [[0, 1], [1, 2], [2, 0]]], n_vertices)
+        unique_keys, halfedge_edges = np.unique(keys, return_inverse=True)
+        unique_edges = decode_edge_keys(unique_keys, n_vertices, faces.dtype)
+        _EDGE_INDEX_CACHE = (faces, unique_edges, halfedge_edges.reshape(-1))
+    return _EDGE_INDEX_CACHE[1], _EDGE_INDEX_CACHE[2]
 
 
-def get_region_boundary_edges(mesh, face_indices):
+def get_mesh_face_shading(vertices, faces):
+    """
+    获取整个网格每个面片的光照系数（每个网格在每个进程中只计算一次，所有 region 共用）
+    
+    与 matplotlib 的 shade=True 相同：法向量与默认光源方向点积，映射到 [0.3, 1]。
+    
+    Args:
+        vertices: (V, 3) 顶点数组
+        faces: (F, 3) 面片索引数组
+    
+    Returns:
+        face_shade: (F,) 面片颜色的 RGB 缩放系数
+    """
+    global _FACE_SHADE_CACHE
+    if (_FACE_SHADE_CACHE is None or _FACE_SHADE_CACHE[0] is not vertices
+            or _FACE_SHADE_CACHE[1] is not faces):
+        triangles = vertices[faces]
+        normals = np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+        with np.errstate(invalid='ignore', divide='ignore'):
+            shade = (normals / np.linalg.norm(normals, axis=1, keepdims=True)) @ LIGHT_DIRECTION
+        # 退化面片（法向量为零）按 shade = 0 处理
+        shade = np.nan_to_num(shade, nan=0.0)
+        _FACE_SHADE_CACHE = (vertices, faces, 0.3 + 0.7 * (shade + 1) / 2)
+    return _FACE_SHADE_CACHE[2]
+
+
+def get_region_boundary_edges(faces, face_indices):
     """
     获取 region 的边界边
     
     Args:
-        mesh: Trimesh 对象
+        faces: (F, 3) 面片索引数组
         face_indices: region 包含的面片索引列表
     
     Returns:
-        boundary_edges: list of tuples，每个 tuple 是两个顶点索引
+        boundary_edges: (K, 2) ndarray，每行是两个顶点索引（升序）
     """
-    faces = mesh.faces
-    
-    # 构建边到面的映射
-    edge_to_faces = {}
-    
-    for face_idx in face_indices:
-        face = faces[face_idx]
-        # 面片的三条边
-        edges = [
-            tuple(sorted([face[0], face[1]])),
-            tuple(sorted([face[1], face[2]])),
-            tuple(sorted([face[2], face[0]]))
-        ]
-        
-        for edge in edges:
-            if edge not in edge_to_faces:
-                edge_to_faces[edge] = []
-            edge_to_faces[edge].append(face_idx)
+    unique_edges, halfedge_edges = get_mesh_edge_index(faces)
+    face_indices = np.asarray(face_indices, dtype=np.int64)
+    
+    # region 面片的 3 条边直接查全局边编号
+    region_edges = halfedge_edges[(3 * face_indices[:, None] + np.arange(3)).reshape(-1)]
     
     # 边界边是只被一个 region 面片共享的边
-    boundary_edges = [edge for edge, face_list in edge_to_faces.items() if len(face_list) == 1]
+    edge_ids, counts = np.unique(region_edges, return_counts=True)
+    boundary_edges = unique_edges[edge_ids[counts == 1]]
     
     return boundary_edges
 
 
-def visualize_all_regions(mesh, regions, output_dir, mesh_name, mode='simple'):
+def get_region_boundary_and_bounds(vertices, faces, face_indices, with_boundary=True):
     """
-    可视化所有 regions，每个 region 生成一个 PNG 文件
+    一次性计算 region 的三角形、边界边和包围盒（共用同一份面片索引数组与顶点 gather）
     
     Args:
-        mesh: Trimesh 对象
+        vertices: (V, 3) 顶点数组（原始完整网格）
+        faces: (F, 3) 面片索引数组（原始完整网格）
+        face_indices: region 包含的面片索引列表
+        with_boundary: 是否计算边界边
+    
+    Returns:
+        region_triangles: (K, 3, 3) region 面片的三角形顶点数组
+        boundary_edges: (B, 2) 边界边数组（with_boundary=False 时为空数组）
+        mid: (3,) 包围盒中心
+        max_range: 包围盒最大边长的一半
+    """
+    face_indices = np.asarray(face_indices, dtype=np.int64)
+    region_triangles = vertices[faces[face_indices]]
+    
+    # 包围盒直接对三角形顶点坐标归约，无需 np.unique 去重；
+    # 没有有效范围时使用整个网格的范围
+    mid, max_range = compute_bounds(region_triangles)
+    if max_range < 1e-6:
+        mid, max_range = compute_bounds(vertices)
+    
+    if with_boundary:
+        boundary_edges = get_region_boundary_edges(faces, face_indices)
+    else:
+        boundary_edges = np.empty((0, 2), dtype=faces.dtype)
+    
+    return region_triangles, boundary_edges, mid, max_range
+
+
+def render_region(vertices, faces, mode, face_indices, region_id, output_path, dpi=150,
+                  background_faces=None, pdf=None):
+    """按可视化模式渲染单个 region"""
+    if mode == 'simple':
+        visualize_region(vertices, faces, face_indices, region_id, output_path, 
+                       highlight_edges=True, edge_color='red', edge_width=2.5, dpi=dpi,
+                       background_faces=background_faces, pdf=pdf)
+    elif mode == '4view':
+        visualize_region_4view(vertices, faces, face_indices, region_id, output_path,
+                              highlight_edges=True, edge_color='red', edge_width=2.0, dpi=dpi,
+                              background_faces=background_faces, pdf=pdf)
+
+
+def _init_region_worker(vertices, faces, background_faces=None):
+    """进程池初始化：使用非交互式后端，并在子进程中缓存一份网格数组"""
+    global _WORKER_VERTICES, _WORKER_FACES, _WORKER_BACKGROUND_FACES
+    import matplotlib
+    matplotlib.use('Agg')
+    _WORKER_VERTICES = vertices
+    _WORKER_FACES = faces
+    _WORKER_BACKGROUND_FACES = background_faces
+
+
+def _render_region_task(task):
+    """子进程任务入口，task 为 (mode, face_indices, region_id, output_path, dpi)"""
+    mode, face_indices, region_id, output_path, dpi = task
+    render_region(_WORKER_VERTICES, _WORKER_FACES, mode, face_indices, region_id, output_path, dpi,
+                  background_faces=_WORKER_BACKGROUND_FACES)
+    return region_id
+
+
+def visualize_all_regions(vertices, faces, regions, output_dir, mesh_name, mode='simple',
+                          workers=1, dpi=150, background_faces=None, single_pdf=False):
+    """
+    可视化所有 regions，每个 region 生成一个 PNG 文件（或合并为一个多页 PDF）
+    
+    Args:
+        vertices: (V, 3) 顶点数组
+        faces: (F, 3) 面片索引数组
         regions: dict，key 为 region_id，value 为 face_index 列表
         output_dir: 输出目录
         mesh_name: 模型名称
         mode: 可视化模式，'simple' 或 '4view'
+        workers: 并行渲染的进程数（1 为串行）
+        dpi: 输出图片分辨率
+        background_faces: 背景线框使用的面片（默认使用完整的 faces，见 select_background_faces）
+        single_pdf: 为 True 时所有 region 依次写入 {mesh_name}_regions.pdf 的各页，不生成 PNG
+            （便于查看的合并输出，只能串行写入，忽略 workers）
     """
     print(f"\nGenerating region visualizations for {mesh_name}...")
     print(f"  Total regions: {len(regions)}")
@@ -292,23 +494,48 @@ def visualize_all_regions(mesh, regions, output_dir, mesh_name, mode='simple'):
     # 确保输出目录存在
     os.makedirs(output_dir, exist_ok=True)
     
-    # 为每个 region 生成可视化
-    for region_id, face_indices in sorted(regions.items()):
-        if mode == 'simple':
-            output_path = os.path.join(output_dir, f"{mesh_name}_region_{region_id:03d}.png")
-            visualize_region(mesh, face_indices, region_id, output_path, 
-                           highlight_edges=True, edge_color='red', edge_width=2.5)
-        elif mode == '4view':
-            output_path = os.path.join(output_dir, f"{mesh_name}_region_{region_id:03d}_4view.png")
-            visualize_region_4view(mesh, face_indices, region_id, output_path,
-                                  highlight_edges=True, edge_color='red', edge_width=2.0)
+    # 每个 region 一个独立的渲染任务
+    suffix = '_4view' if mode == '4view' else ''
+    tasks = [
+        (mode, face_indices, region_id,
+         os.path.join(output_dir, f"{mesh_name}_region_{region_id:03d}{suffix}.png"), dpi)
+        for region_id, face_indices in sorted(regions.items())
+    ]
+    
+    workers = min(workers or 1, len(tasks))
+    if single_pdf:
+        # 所有 region 复用同一画布，依次追加为 PDF 的一页（同一个 PDF 文件只能串行写入）
+        from matplotlib.backends.backend_pdf import PdfPages
+        if workers > 1:
+            print(f"  Note: --single-pdf renders serially, ignoring {workers} workers")
+        pdf_path = os.path.join(output_dir, f"{mesh_name}_regions{suffix}.pdf")
+        with PdfPages(pdf_path) as pdf:
+            for task_mode, face_indices, region_id, _, task_dpi in tasks:
+                render_region(vertices, faces, task_mode, face_indices, region_id, None, task_dpi,
+                              background_faces=background_faces, pdf=pdf)
+        close_region_canvases()
+        print(f"  Saved {len(tasks)} regions to {pdf_path}")
+    elif workers <= 1:
+        for task in tasks:
+            render_region(vertices, faces, *task, background_faces=background_faces)
+        close_region_canvases()
+    else:
+        # 各 region 互不依赖，网格数组只在每个子进程初始化时传递一次
+        print(f"  Rendering with {workers} worker processes")
+        with ProcessPoolExecutor(max_workers=workers,
+                                 mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=_init_region_worker,
+                                 initargs=(vertices, faces, background_faces)) as executor:
+            list(executor.map(_render_region_task, tasks))
     
     print(f"  Generated {len(regions)} region visualizations in {output_dir}")
 
 
 def load_mesh(obj_path):
-    """加载 OBJ 文件"""
-    mesh = trimesh.load(obj_path, force='mesh')
+    """加载 OBJ 文件（跳过材质/贴图加载，只需要几何）"""
+    # 保持默认的 process=True：与 crease_identification.py 相同的顶点合并结果，
+    # 保证 regions CSV 中的面片索引与这里加载的网格一致
+    mesh = trimesh.load(obj_path, force='mesh', skip_materials=True)
     return mesh
 
 
@@ -360,6 +587,16 @@ def main():
                         help='Visualization mode: simple (default) or 4view')
     parser.add_argument('--no-edges', action='store_true',
                         help='Do not highlight boundary edges')
+    parser.add_argument('--workers', '-w', type=int, default=None,
+                        help='Number of worker processes for rendering regions (default: number of CPUs)')
+    parser.add_argument('--dpi', type=int, default=150,
+                        help='Resolution of the region images (default: 150)')
+    parser.add_argument('--single-pdf', action='store_true',
+                        help='Write all regions as pages of a single PDF instead of one PNG per region '
+                             '(convenience output; always renders serially and ignores --workers)')
+    parser.add_argument('--max-background-faces', type=int, default=50000,
+                        help='Maximum number of faces drawn in the gray background mesh; larger meshes '
+                             'are uniformly subsampled (0 = no limit, default: 50000)')
     
     args = parser.parse_args()
     
@@ -384,6 +621,14 @@ def main():
     mesh = load_mesh(args.input)
     print(f"  Loaded mesh: {len(mesh.vertices)} vertices, {len(mesh.faces)} faces")
     
+    # 一次性取出 float32 顶点 / int32 面片数组，后续绘制不再访问 trimesh 属性
+    vertices, faces = get_plot_arrays(mesh)
+    
+    # 背景线框只作参考，大网格按预算抽样
+    background_faces = select_background_faces(faces, args.max_background_faces)
+    if len(background_faces) < len(faces):
+        print(f"  Background mesh subsampled to {len(background_faces)} of {len(faces)} faces")
+    
     # 加载 regions
     print(f"\nLoading regions from {regions_csv}...")
     regions = load_regions_from_csv(regions_csv)
@@ -402,7 +647,9 @@ def main():
     if highlight_edges:
         print("\nBoundary edges will be highlighted in red")
     
-    visualize_all_regions(mesh, regions, regions_output_dir, mesh_name, mode=args.mode)
+    visualize_all_regions(vertices, faces, regions, regions_output_dir, mesh_name, mode=args.mode,
+                          workers=args.workers or os.cpu_count() or 1, dpi=args.dpi,
+                          background_faces=background_faces, single_pdf=args.single_pdf)
     
     print(f"\nAll region visualizations saved to: {regions_output_dir}")
     print("Done!")